@@ -68,8 +68,8 @@ class BaselineModel(RecommenderBase):
             X {pandas DataFrame} -- Dataframe containing columns user_id, item_id
             y {pandas Series} -- Series containing rating
         """
-        X = self._preprocess_data(X=X, y=y, type="fit")
-        self.global_mean = X["rating"].mean()
+        data = self._preprocess_data(X=X, y=y, type="fit")
+        self.global_mean = data.ratings.mean(dtype=np.float64)
 
         # Initialize parameters
         self.user_biases = np.zeros(self.n_users)
@@ -78,7 +78,9 @@ class BaselineModel(RecommenderBase):
         # Run parameter estimation
         if self.method == "sgd":
             self.user_biases, self.item_biases, self.train_rmse = _sgd(
-                X=X.to_numpy(),
+                user_ids=data.user_ids,
+                item_ids=data.item_ids,
+                ratings=data.ratings,
                 global_mean=self.global_mean,
                 user_biases=self.user_biases,
                 item_biases=self.item_biases,
@@ -90,7 +92,9 @@ class BaselineModel(RecommenderBase):
 
         elif self.method == "als":
             self.user_biases, self.item_biases, self.train_rmse = _als(
-                X=X.to_numpy(),
+                user_ids=data.user_ids,
+                item_ids=data.item_ids,
+                ratings=data.ratings,
                 global_mean=self.global_mean,
                 user_biases=self.user_biases,
                 item_biases=self.item_biases,
@@ -116,11 +120,12 @@ class BaselineModel(RecommenderBase):
         if X.shape[0] == 0:
             return []
 
-        X = self._preprocess_data(X=X, type="predict")
+        data = self._preprocess_data(X=X, type="predict")
 
         # Get predictions
         predictions, predictions_possible = _predict(
-            X=X.to_numpy(),
+            user_ids=data.user_ids,
+            item_ids=data.item_ids,
             global_mean=self.global_mean,
             min_rating=self.min_rating,
             max_rating=self.max_rating,
@@ -154,7 +159,7 @@ class BaselineModel(RecommenderBase):
             n_epochs (int, optional): Number of epochs to run SGD. Defaults to 20.
             verbose (int, optional): Verbosity when updating, 0 for nothing and 1 for training messages. Defaults to 0.
         """
-        X, known_users, new_users = self._preprocess_data(X=X, y=y, type="update")
+        data, known_users, new_users = self._preprocess_data(X=X, y=y, type="update")
 
         # Re-initialize user bias for old users
         for user in known_users:
@@ -166,7 +171,9 @@ class BaselineModel(RecommenderBase):
 
         # Estimate new bias parameter
         self.user_biases, _, self.train_rmse = _sgd(
-            X=X.to_numpy(),
+            user_ids=data.user_ids,
+            item_ids=data.item_ids,
+            ratings=data.ratings,
             global_mean=self.global_mean,
             user_biases=self.user_biases,
             item_biases=self.item_biases,
@@ -182,13 +189,20 @@ class BaselineModel(RecommenderBase):
 
 @nb.njit()
 def _calculate_rmse(
-    X: np.ndarray, global_mean: float, user_biases: np.ndarray, item_biases: np.ndarray
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
+    ratings: np.ndarray,
+    global_mean: float,
+    user_biases: np.ndarray,
+    item_biases: np.ndarray,
 ):
     """
     Calculates root mean squared error for given data and model parameters
 
     Args:
-        X (np.ndarray): Matrix with columns user, item and rating
+        user_ids (np.ndarray): Vector of assigned user ids
+        item_ids (np.ndarray): Vector of assigned item ids
+        ratings (np.ndarray): Vector of ratings for each user and item
         global_mean (float): Global mean rating
         user_biases (np.ndarray): User biases vector of shape (n_users, 1)
         item_biases (np.ndarray): Item biases vector of shape (n_items, 1)
@@ -196,12 +210,12 @@ def _calculate_rmse(
     Returns:
         rmse [float]: Root mean squared error
     """
-    n_ratings = X.shape[0]
+    n_ratings = ratings.shape[0]
     errors = np.zeros(n_ratings)
 
     # Iterate through all user-item ratings
     for i in range(n_ratings):
-        user_id, item_id, rating = int(X[i, 0]), int(X[i, 1]), X[i, 2]
+        user_id, item_id, rating = user_ids[i], item_ids[i], ratings[i]
 
         # Calculate prediction and error
         pred = global_mean + user_biases[user_id] + item_biases[item_id]
@@ -214,7 +228,9 @@ def _calculate_rmse(
 
 @nb.njit()
 def _sgd(
-    X: np.ndarray,
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
+    ratings: np.ndarray,
     global_mean: float,
     user_biases: np.ndarray,
     item_biases: np.ndarray,
@@ -229,7 +245,9 @@ def _sgd(
     Performs Stochastic Gradient Descent to estimate the user_biases and item_biases
 
     Arguments:
-        X {numpy array} -- User-item rating matrix
+        user_ids {numpy array} -- Contiguous int32 vector of assigned user ids
+        item_ids {numpy array} -- Contiguous int32 vector of assigned item ids
+        ratings {numpy array} -- Contiguous vector of ratings for each user and item
         global_mean {float} -- Global mean of all ratings
         user_biases {numpy array} -- User biases vector of shape (n_users, 1)
         item_biases {numpy array} -- Item biases vector of shape (n_items, 1)
@@ -245,15 +263,17 @@ def _sgd(
         item_biases [np.ndarray] -- Updated item_bases vector
         train_rmse -- Training rmse values
     """
+    n_ratings = ratings.shape[0]
+    order = np.arange(n_ratings, dtype=np.int32)
     train_rmse = []
 
     for epoch in range(n_epochs):
-        # Shuffle data before each epoch
-        np.random.shuffle(X)
+        # Visit the ratings in a new random order each epoch by shuffling the indices in place
+        np.random.shuffle(order)
 
         # Iterate through all user-item ratings
-        for i in range(X.shape[0]):
-            user_id, item_id, rating = int(X[i, 0]), int(X[i, 1]), X[i, 2]
+        for i in order:
+            user_id, item_id, rating = user_ids[i], item_ids[i], ratings[i]
 
             # Compute error
             rating_pred = global_mean + user_biases[user_id] + item_biases[item_id]
@@ -267,7 +287,9 @@ def _sgd(
 
         # Calculate error and print
         rmse = _calculate_rmse(
-            X=X,
+            user_ids=user_ids,
+            item_ids=item_ids,
+            ratings=ratings,
             global_mean=global_mean,
             user_biases=user_biases,
             item_biases=item_biases,
@@ -282,7 +304,9 @@ def _sgd(
 
 @nb.njit()
 def _als(
-    X: np.ndarray,
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
+    ratings: np.ndarray,
     global_mean: float,
     user_biases: np.ndarray,
     item_biases: np.ndarray,
@@ -297,7 +321,9 @@ def _als(
     which is also similar to the implementation in Surprise.
 
     Arguments:
-        X {numpy array} -- User-item rating matrix
+        user_ids {numpy array} -- Contiguous int32 vector of assigned user ids
+        item_ids {numpy array} -- Contiguous int32 vector of assigned item ids
+        ratings {numpy array} -- Contiguous vector of ratings for each user and item
         global_mean {float} -- Global mean of all ratings
         user_biases {numpy array} -- User biases vector of shape (n_users, 1)
         item_biases {numpy array} -- Item biases vector of shape (n_items, 1)
@@ -317,8 +343,8 @@ def _als(
     # Get counts of all users and items
     user_counts = np.zeros(n_users)
     item_counts = np.zeros(n_items)
-    for i in range(X.shape[0]):
-        user_id, item_id = int(X[i, 0]), int(X[i, 1])
+    for i in range(ratings.shape[0]):
+        user_id, item_id = user_ids[i], item_ids[i]
         user_counts[user_id] += 1
         item_counts[item_id] += 1
 
@@ -329,8 +355,8 @@ def _als(
         user_biases = np.zeros(n_users)
 
         # Iterate through all user-item ratings
-        for i in range(X.shape[0]):
-            user_id, item_id, rating = int(X[i, 0]), int(X[i, 1]), X[i, 2]
+        for i in range(ratings.shape[0]):
+            user_id, item_id, rating = user_ids[i], item_ids[i], ratings[i]
             user_biases[user_id] += rating - global_mean - item_biases[item_id]
 
         # Set user bias estimation
@@ -340,8 +366,8 @@ def _als(
         item_biases = np.zeros(n_items)
 
         # Iterate through all user-item ratings
-        for i in range(X.shape[0]):
-            user_id, item_id, rating = int(X[i, 0]), int(X[i, 1]), X[i, 2]
+        for i in range(ratings.shape[0]):
+            user_id, item_id, rating = user_ids[i], item_ids[i], ratings[i]
             item_biases[item_id] += rating - global_mean - user_biases[user_id]
 
         # Set item bias estimation
@@ -349,7 +375,9 @@ def _als(
 
         # Calculate error and print
         rmse = _calculate_rmse(
-            X=X,
+            user_ids=user_ids,
+            item_ids=item_ids,
+            ratings=ratings,
             global_mean=global_mean,
             user_biases=user_biases,
             item_biases=item_biases,
@@ -364,7 +392,8 @@ def _als(
 
 @nb.njit()
 def _predict(
-    X: np.ndarray,
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
     global_mean: float,
     min_rating: int,
     max_rating: int,
@@ -376,7 +405,8 @@ def _predict(
     Calculate predicted ratings for each user-item pair.
 
     Arguments:
-        X {np.ndarray} -- Matrix with columns representing (user_id, item_id)
+        user_ids {np.ndarray} -- Vector of assigned user ids, -1 for unknown users
+        item_ids {np.ndarray} -- Vector of assigned item ids, -1 for unknown items
         global_mean {float} -- Global mean of all ratings
         min_rating {int} -- Lowest rating possible
         max_rating {int} -- Highest rating possible
@@ -385,15 +415,15 @@ def _predict(
         bound_ratings {boolean} -- Whether to bound predictions in between range [min_rating, max_rating]
 
     Returns:
-        predictions [np.ndarray] -- Vector containing rating predictions of all user, items in same order as input X
+        predictions [np.ndarray] -- Vector containing rating predictions of all user, items in same order as input user_ids and item_ids
         predictions_possible [np.ndarray] -- Vector of whether both given user and item were contained in the data that the model was fitted on
     """
 
     predictions = []
     predictions_possible = []
 
-    for i in range(X.shape[0]):
-        user_id, item_id = int(X[i, 0]), int(X[i, 1])
+    for i in range(user_ids.shape[0]):
+        user_id, item_id = user_ids[i], item_ids[i]
         user_known = user_id != -1
         item_known = item_id != -1
 
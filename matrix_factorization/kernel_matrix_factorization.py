@@ -34,6 +34,13 @@ class KernelMF(RecommenderBase):
         min_rating {int} -- Smallest rating possible (default: {0})
         max_rating {int} -- Largest rating possible (default: {5})
         verbose {str} -- Verbosity when fitting. Values possible are 0 to not print anything, 1 to print fitting model (default: {1})
+        update_item_biases {bool} -- Whether to fit item biases or keep them at zero (default: {True})
+        n_blocks {int} -- Number of ranges to split users and items into for stratified SGD. If greater than 1 then ratings blocks which share
+                          no users or items are fitted in parallel. Ignored by 'als' (default: {1})
+        method {str} -- Method to estimate parameters. Can be one of 'sgd' or 'als'. 'als' is only available for the linear kernel (default: {'sgd'})
+        lr_decay {float} -- Decay rate of the learning rate for SGD. The learning rate of epoch t is lr / (1 + lr_decay * t) (default: {0})
+        momentum {float} -- Momentum coefficient for SGD. 0 for plain stochastic gradient descent. Ignored by 'als' (default: {0})
+        nesterov {bool} -- Whether to use Nesterov momentum for SGD. Ignored if momentum is 0 (default: {False})
 
     Attributes:
         n_users {int} -- Number of users
@@ -63,10 +70,30 @@ class KernelMF(RecommenderBase):
         max_rating: int = 5,
         verbose: int = 1,
         update_item_biases: bool = True,
+        n_blocks: int = 1,
+        method: str = "sgd",
+        lr_decay: float = 0,
+        momentum: float = 0,
+        nesterov: bool = False,
     ):
+        if method not in ("sgd", "als"):
+            raise ValueError('Method param must be either "sgd" or "als"')
+
         if kernel not in ("linear", "sigmoid", "rbf"):
             raise ValueError("Kernel must be one of linear, sigmoid, or rbf")
 
+        if method == "als" and kernel != "linear":
+            raise ValueError('Method "als" is only available for the linear kernel')
+
+        if n_blocks < 1:
+            raise ValueError("n_blocks must be a positive integer")
+
+        if lr_decay < 0:
+            raise ValueError("lr_decay must be non-negative")
+
+        if not 0 <= momentum < 1:
+            raise ValueError("momentum must be in the range [0, 1)")
+
         super().__init__(min_rating=min_rating, max_rating=max_rating, verbose=verbose)
 
         self.n_factors = n_factors
@@ -78,6 +105,11 @@ class KernelMF(RecommenderBase):
         self.init_mean = init_mean
         self.init_sd = init_sd
         self.update_item_biases = update_item_biases
+        self.n_blocks = n_blocks
+        self.method = method
+        self.lr_decay = lr_decay
+        self.momentum = momentum
+        self.nesterov = nesterov
         return
 
     def fit(self, X: pd.DataFrame, y: pd.Series):
@@ -88,45 +120,137 @@ class KernelMF(RecommenderBase):
             X {pandas DataFrame} -- Dataframe containing columns user_id, item_id 
             y {pandas Series} -- Series containing ratings
         """
-        X = self._preprocess_data(X=X, y=y, type="fit")
-        self.global_mean = X["rating"].mean()
+        data = self._preprocess_data(X=X, y=y, type="fit")
+        self.global_mean = data.ratings.mean(dtype=np.float64)
 
-        # Initialize vector bias parameters
-        self.user_biases = np.zeros(self.n_users)
-        self.item_biases = np.zeros(self.n_items)
+        # Initialize vector bias parameters. Parameters are stored as float32 to conserve memory
+        self.user_biases = np.zeros(self.n_users, dtype=np.float32)
+        self.item_biases = np.zeros(self.n_items, dtype=np.float32)
 
         # Initialize latent factor parameters of matrices P and Q
         self.user_features = np.random.normal(
             self.init_mean, self.init_sd, (self.n_users, self.n_factors)
-        )
+        ).astype(np.float32)
         self.item_features = np.random.normal(
             self.init_mean, self.init_sd, (self.n_items, self.n_factors)
-        )
+        ).astype(np.float32)
 
-        # Perform stochastic gradient descent
         (
-            self.user_features,
-            self.item_features,
-            self.user_biases,
-            self.item_biases,
-            self.train_rmse,
-        ) = _sgd(
-            X=X.to_numpy(),
-            global_mean=self.global_mean,
-            user_biases=self.user_biases,
-            item_biases=self.item_biases,
-            user_features=self.user_features,
-            item_features=self.item_features,
-            n_epochs=self.n_epochs,
-            kernel=self.kernel,
-            gamma=self.gamma,
-            lr=self.lr,
-            reg=self.reg,
-            min_rating=self.min_rating,
-            max_rating=self.max_rating,
-            verbose=self.verbose,
-            update_item_biases=self.update_item_biases,
-        )
+            user_bias_velocity,
+            item_bias_velocity,
+            user_feature_velocity,
+            item_feature_velocity,
+        ) = self._init_velocities()
+
+        # Run parameter estimation. Stochastic gradient descent runs in parallel over strata of the ratings matrix if more than one
+        # block is used
+        if self.method == "als":
+            user_order, user_ptr = _group_by(ids=data.user_ids, n_groups=self.n_users)
+            item_order, item_ptr = _group_by(ids=data.item_ids, n_groups=self.n_items)
+            (
+                self.user_features,
+                self.item_features,
+                self.user_biases,
+                self.item_biases,
+                self.train_rmse,
+            ) = _als(
+                user_ids=data.user_ids,
+                item_ids=data.item_ids,
+                ratings=data.ratings,
+                user_order=user_order,
+                user_ptr=user_ptr,
+                item_order=item_order,
+                item_ptr=item_ptr,
+                global_mean=self.global_mean,
+                user_biases=self.user_biases,
+                item_biases=self.item_biases,
+                user_features=self.user_features,
+                item_features=self.item_features,
+                n_epochs=self.n_epochs,
+                reg=self.reg,
+                min_rating=self.min_rating,
+                max_rating=self.max_rating,
+                verbose=self.verbose,
+                update_item_biases=self.update_item_biases,
+            )
+
+        elif self.n_blocks > 1:
+            block_order, block_ptr = _stratify(
+                user_ids=data.user_ids,
+                item_ids=data.item_ids,
+                n_users=self.n_users,
+                n_items=self.n_items,
+                n_blocks=self.n_blocks,
+            )
+            (
+                self.user_features,
+                self.item_features,
+                self.user_biases,
+                self.item_biases,
+                self.train_rmse,
+            ) = _stratified_sgd(
+                user_ids=data.user_ids,
+                item_ids=data.item_ids,
+                ratings=data.ratings,
+                block_order=block_order,
+                block_ptr=block_ptr,
+                n_blocks=self.n_blocks,
+                global_mean=self.global_mean,
+                user_biases=self.user_biases,
+                item_biases=self.item_biases,
+                user_features=self.user_features,
+                item_features=self.item_features,
+                user_bias_velocity=user_bias_velocity,
+                item_bias_velocity=item_bias_velocity,
+                user_feature_velocity=user_feature_velocity,
+                item_feature_velocity=item_feature_velocity,
+                n_epochs=self.n_epochs,
+                kernel=self.kernel,
+                gamma=self.gamma,
+                lr=self.lr,
+                lr_decay=self.lr_decay,
+                momentum=self.momentum,
+                nesterov=self.nesterov,
+                reg=self.reg,
+                min_rating=self.min_rating,
+                max_rating=self.max_rating,
+                verbose=self.verbose,
+                update_item_biases=bool(self.update_item_biases),
+            )
+
+        else:
+            (
+                self.user_features,
+                self.item_features,
+                self.user_biases,
+                self.item_biases,
+                self.train_rmse,
+            ) = _sgd(
+                user_ids=data.user_ids,
+                item_ids=data.item_ids,
+                ratings=data.ratings,
+                global_mean=self.global_mean,
+                user_biases=self.user_biases,
+                item_biases=self.item_biases,
+                user_features=self.user_features,
+                item_features=self.item_features,
+                user_bias_velocity=user_bias_velocity,
+                item_bias_velocity=item_bias_velocity,
+                user_feature_velocity=user_feature_velocity,
+                item_feature_velocity=item_feature_velocity,
+                n_epochs=self.n_epochs,
+                kernel=self.kernel,
+                gamma=self.gamma,
+                lr=self.lr,
+                lr_decay=self.lr_decay,
+                momentum=self.momentum,
+                nesterov=self.nesterov,
+                reg=self.reg,
+                min_rating=self.min_rating,
+                max_rating=self.max_rating,
+                verbose=self.verbose,
+                update_item_biases=bool(self.update_item_biases),
+            )
 
         return self
 
@@ -145,11 +269,12 @@ class KernelMF(RecommenderBase):
         if X.shape[0] == 0:
             return []
 
-        X = self._preprocess_data(X=X, type="predict")
+        data = self._preprocess_data(X=X, type="predict")
 
         # Get predictions
         predictions, predictions_possible = _predict(
-            X=X.to_numpy(),
+            user_ids=data.user_ids,
+            item_ids=data.item_ids,
             global_mean=self.global_mean,
             user_biases=self.user_biases,
             item_biases=self.item_biases,
@@ -162,8 +287,8 @@ class KernelMF(RecommenderBase):
             bound_ratings=bound_ratings,
         )
 
-        self.predictions_possible = predictions_possible
-        return predictions
+        self.predictions_possible = predictions_possible.tolist()
+        return predictions.tolist()
 
     def update_users(
         self,
@@ -186,7 +311,7 @@ class KernelMF(RecommenderBase):
             n_epochs (int, optional): Number of epochs to run SGD. Defaults to 20.
             verbose (int, optional): Verbosity when updating, 0 for nothing and 1 for training messages. Defaults to 0.
         """
-        X, known_users, new_users = self._preprocess_data(X=X, y=y, type="update")
+        data, known_users, new_users = self._preprocess_data(X=X, y=y, type="update")
         n_new_users = len(new_users)
 
         # Re-initialize params for old users
@@ -202,16 +327,25 @@ class KernelMF(RecommenderBase):
             )
 
         # Add bias parameters for new users
-        self.user_biases = np.append(self.user_biases, np.zeros(n_new_users))
+        self.user_biases = np.append(
+            self.user_biases, np.zeros(n_new_users, dtype=np.float32)
+        )
 
         # Add latent factor parameters for new users by adding rows to P matrix
         new_user_features = np.random.normal(
             self.init_mean, self.init_sd, (n_new_users, self.n_factors)
-        )
+        ).astype(np.float32)
         self.user_features = np.concatenate(
             (self.user_features, new_user_features), axis=0
         )
 
+        (
+            user_bias_velocity,
+            item_bias_velocity,
+            user_feature_velocity,
+            item_feature_velocity,
+        ) = self._init_velocities()
+
         # Estimate new parameters
         (
             self.user_features,
@@ -220,29 +354,69 @@ class KernelMF(RecommenderBase):
             self.item_biases,
             self.train_rmse,
         ) = _sgd(
-            X=X.to_numpy(),
+            user_ids=data.user_ids,
+            item_ids=data.item_ids,
+            ratings=data.ratings,
             global_mean=self.global_mean,
             user_biases=self.user_biases,
             item_biases=self.item_biases,
             user_features=self.user_features,
             item_features=self.item_features,
+            user_bias_velocity=user_bias_velocity,
+            item_bias_velocity=item_bias_velocity,
+            user_feature_velocity=user_feature_velocity,
+            item_feature_velocity=item_feature_velocity,
             n_epochs=n_epochs,
             kernel=self.kernel,
             gamma=self.gamma,
             lr=lr,
+            lr_decay=self.lr_decay,
+            momentum=self.momentum,
+            nesterov=self.nesterov,
             reg=self.reg,
             min_rating=self.min_rating,
             max_rating=self.max_rating,
             verbose=verbose,
             update_item_params=False,
+            update_item_biases=bool(self.update_item_biases),
         )
 
         return
 
+    def _init_velocities(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Creates zero momentum velocities for user biases, item biases, user features and item features. If momentum is not used the
+        velocities are never read so empty arrays are returned instead
+
+        Returns:
+            user_bias_velocity [np.ndarray] -- Velocities of user biases
+            item_bias_velocity [np.ndarray] -- Velocities of item biases
+            user_feature_velocity [np.ndarray] -- Velocities of user features
+            item_feature_velocity [np.ndarray] -- Velocities of item features
+        """
+        if self.momentum == 0:
+            return (
+                np.zeros(0, dtype=np.float32),
+                np.zeros(0, dtype=np.float32),
+                np.zeros((0, self.n_factors), dtype=np.float32),
+                np.zeros((0, self.n_factors), dtype=np.float32),
+            )
+
+        return (
+            np.zeros_like(self.user_biases),
+            np.zeros_like(self.item_biases),
+            np.zeros_like(self.user_features),
+            np.zeros_like(self.item_features),
+        )
+
 
 @nb.njit()
 def _calculate_rmse(
-    X: np.ndarray,
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
+    ratings: np.ndarray,
     global_mean: float,
     user_biases: np.ndarray,
     item_biases: np.ndarray,
@@ -257,7 +431,9 @@ def _calculate_rmse(
     Calculates root mean squared error for given data and model parameters
 
     Args:
-        X (np.ndarray): Matrix with columns user, item and rating
+        user_ids (np.ndarray): Vector of assigned user ids
+        item_ids (np.ndarray): Vector of assigned item ids
+        ratings (np.ndarray): Vector of ratings for each user and item
         global_mean (float): Global mean rating
         user_biases (np.ndarray): User biases vector of shape (n_users, 1)
         item_biases (np.ndarray): Item biases vector of shape (n_items, 1)
@@ -271,12 +447,12 @@ def _calculate_rmse(
     Returns:
         rmse [float]: Root mean squared error
     """
-    n_ratings = X.shape[0]
+    n_ratings = ratings.shape[0]
     errors = np.zeros(n_ratings)
 
     # Iterate through all user-item ratings and calculate error
     for i in range(n_ratings):
-        user_id, item_id, rating = int(X[i, 0]), int(X[i, 1]), X[i, 2]
+        user_id, item_id, rating = user_ids[i], item_ids[i], ratings[i]
         user_bias = user_biases[user_id]
         item_bias = item_biases[item_id]
         user_feature_vec = user_features[user_id, :]
@@ -320,14 +496,145 @@ def _calculate_rmse(
     return rmse
 
 
-@nb.njit()
+@nb.njit(fastmath=True, cache=True)
+def _sgd_step(
+    user_id: int,
+    item_id: int,
+    rating: float,
+    global_mean: float,
+    user_biases: np.ndarray,
+    item_biases: np.ndarray,
+    user_features: np.ndarray,
+    item_features: np.ndarray,
+    user_bias_velocity: np.ndarray,
+    item_bias_velocity: np.ndarray,
+    user_feature_velocity: np.ndarray,
+    item_feature_velocity: np.ndarray,
+    kernel: str,
+    gamma: float,
+    lr: float,
+    reg: float,
+    momentum: float,
+    nesterov: bool,
+    min_rating: float,
+    max_rating: float,
+    update_user_params: bool,
+    update_item_params: bool,
+    update_item_biases: bool,
+):
+    """
+    Performs a single stochastic gradient descent update for a given user, item and rating using the chosen kernel
+
+    Arguments:
+        user_id {int} -- User id
+        item_id {int} -- Item id
+        rating {float} -- Rating for user and item
+        global_mean {float} -- Global mean of all ratings
+        user_biases {numpy array} -- User biases vector of shape (n_users, 1)
+        item_biases {numpy array} -- Item biases vector of shape (n_items, 1)
+        user_features {numpy array} -- Matrix P of user features of shape (n_users, n_factors)
+        item_features {numpy array} -- Matrix Q of item features of shape (n_items, n_factors)
+        user_bias_velocity {numpy array} -- Momentum velocities of user biases. Only used if momentum is positive
+        item_bias_velocity {numpy array} -- Momentum velocities of item biases. Only used if momentum is positive
+        user_feature_velocity {numpy array} -- Momentum velocities of user features. Only used if momentum is positive
+        item_feature_velocity {numpy array} -- Momentum velocities of item features. Only used if momentum is positive
+        kernel {str} -- Kernel function to use between user and item features. Options are 'linear', 'logistic', and 'rbf'.
+        gamma {float} -- Kernel coefficient for 'rbf'. Ignored by other kernels.
+        lr {float} -- Learning rate alpha
+        reg {float} -- Regularization parameter lambda for Frobenius norm
+        momentum {float} -- Momentum coefficient. 0 for plain stochastic gradient descent
+        nesterov {bool} -- Whether to use Nesterov momentum
+        min_rating {float} -- Minimum possible rating
+        max_rating {float} -- Maximum possible rating
+        update_user_params {bool} -- Whether to update user parameters or not
+        update_item_params {bool} -- Whether to update item parameters or not
+        update_item_biases {bool} -- Whether to update item biases or keep them unchanged. Ignored by the 'rbf' kernel
+    """
+    if kernel == "linear":
+        kernel_linear_sgd_update(
+            user_id=user_id,
+            item_id=item_id,
+            rating=rating,
+            global_mean=global_mean,
+            user_biases=user_biases,
+            item_biases=item_biases,
+            user_features=user_features,
+            item_features=item_features,
+            user_bias_velocity=user_bias_velocity,
+            item_bias_velocity=item_bias_velocity,
+            user_feature_velocity=user_feature_velocity,
+            item_feature_velocity=item_feature_velocity,
+            lr=lr,
+            reg=reg,
+            momentum=momentum,
+            nesterov=nesterov,
+            update_user_params=update_user_params,
+            update_item_params=update_item_params,
+            update_item_biases=update_item_biases,
+        )
+
+    elif kernel == "sigmoid":
+        kernel_sigmoid_sgd_update(
+            user_id=user_id,
+            item_id=item_id,
+            rating=rating,
+            global_mean=global_mean,
+            user_biases=user_biases,
+            item_biases=item_biases,
+            user_features=user_features,
+            item_features=item_features,
+            user_bias_velocity=user_bias_velocity,
+            item_bias_velocity=item_bias_velocity,
+            user_feature_velocity=user_feature_velocity,
+            item_feature_velocity=item_feature_velocity,
+            lr=lr,
+            reg=reg,
+            momentum=momentum,
+            nesterov=nesterov,
+            a=min_rating,
+            c=max_rating - min_rating,
+            update_user_params=update_user_params,
+            update_item_params=update_item_params,
+            update_item_biases=update_item_biases,
+        )
+
+    elif kernel == "rbf":
+        kernel_rbf_sgd_update(
+            user_id=user_id,
+            item_id=item_id,
+            rating=rating,
+            user_features=user_features,
+            item_features=item_features,
+            user_feature_velocity=user_feature_velocity,
+            item_feature_velocity=item_feature_velocity,
+            lr=lr,
+            reg=reg,
+            momentum=momentum,
+            nesterov=nesterov,
+            gamma=gamma,
+            a=min_rating,
+            c=max_rating - min_rating,
+            update_user_params=update_user_params,
+            update_item_params=update_item_params,
+        )
+
+    return
+
+
+@nb.njit(fastmath=True, cache=True)
 def _sgd(
-    X: np.ndarray,
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
+    ratings: np.ndarray,
     global_mean: float,
     user_biases: np.ndarray,
     item_biases: np.ndarray,
     user_features: np.ndarray,
     item_features: np.ndarray,
+    user_bias_velocity: np.ndarray,
+    item_bias_velocity: np.ndarray,
+    user_feature_velocity: np.ndarray,
+    item_feature_velocity: np.ndarray,
     n_epochs: int,
     kernel: str,
     gamma: float,
@@ -339,17 +646,26 @@ def _sgd(
     update_user_params: bool = True,
     update_item_params: bool = True,
     update_item_biases: bool = True,
+    lr_decay: float = 0.0,
+    momentum: float = 0.0,
+    nesterov: bool = False,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, list]:
     """
     Performs stochastic gradient descent to estimate parameters.
 
     Arguments:
-        X {numpy array} -- User-item ranking matrix
+        user_ids {numpy array} -- Contiguous int32 vector of assigned user ids
+        item_ids {numpy array} -- Contiguous int32 vector of assigned item ids
+        ratings {numpy array} -- Contiguous vector of ratings for each user and item
         global_mean {float} -- Global mean of all ratings
         user_biases {numpy array} -- User biases vector of shape (n_users, 1)
         item_biases {numpy array} -- Item biases vector of shape (n_items, 1)
         user_features {numpy array} -- Start matrix P of user features of shape (n_users, n_factors)
         item_features {numpy array} -- Start matrix Q of item features of shape (n_items, n_factors)
+        user_bias_velocity {numpy array} -- Momentum velocities of user biases. Only used if momentum is positive
+        item_bias_velocity {numpy array} -- Momentum velocities of item biases. Only used if momentum is positive
+        user_feature_velocity {numpy array} -- Momentum velocities of user features. Only used if momentum is positive
+        item_feature_velocity {numpy array} -- Momentum velocities of item features. Only used if momentum is positive
         n_epochs {int} -- Number of epochs to run
         kernel {str} -- Kernel function to use between user and item features. Options are 'linear', 'logistic', and 'rbf'. 
         gamma {float} -- Kernel coefficient for 'rbf'. Ignored by other kernels. 
@@ -360,6 +676,10 @@ def _sgd(
         verbose {int} -- Verbosity when fitting. 0 for nothing and 1 for printing epochs
         update_user_params {bool} -- Whether to update user parameters or not. Default is True.
         update_item_params {bool} -- Whether to update item  parameters or not. Default is True.
+        update_item_biases {bool} -- Whether to update item biases or keep them at zero. Default is True.
+        lr_decay {float} -- Decay rate of the learning rate. The learning rate of epoch t is lr / (1 + lr_decay * t). Default is 0.
+        momentum {float} -- Momentum coefficient. 0 for plain stochastic gradient descent. Default is 0.
+        nesterov {bool} -- Whether to use Nesterov momentum. Default is False.
 
     Returns:
         user_features [np.ndarray] -- Updated user_features matrix P
@@ -368,72 +688,247 @@ def _sgd(
         item_biases [np.ndarray] -- Updated item_bases vector
         train_rmse [list] -- Training rmse values
     """
+    # Compile a separate specialization for each value of update_item_biases so that the item bias updates are removed at compile time
+    # when they are not needed instead of being checked for every rating
+    nb.literally(update_item_biases)
+
+    n_ratings = ratings.shape[0]
+    order = np.arange(n_ratings, dtype=np.int32)
     train_rmse = []
 
     for epoch in range(n_epochs):
-        # Shuffle dataset before each epoch
-        np.random.shuffle(X)
+        # Learning rate for this epoch following an inverse time decay schedule
+        epoch_lr = lr / (1 + lr_decay * epoch)
+
+        # Visit the ratings in a new random order each epoch by shuffling the indices in place
+        np.random.shuffle(order)
 
         # Iterate through all user-item ratings
-        for i in range(X.shape[0]):
-            user_id, item_id, rating = int(X[i, 0]), int(X[i, 1]), X[i, 2]
-
-            if kernel == "linear":
-                kernel_linear_sgd_update(
-                    user_id=user_id,
-                    item_id=item_id,
-                    rating=rating,
-                    global_mean=global_mean,
-                    user_biases=user_biases,
-                    item_biases=item_biases,
-                    user_features=user_features,
-                    item_features=item_features,
-                    lr=lr,
-                    reg=reg,
-                    update_user_params=update_user_params,
-                    update_item_params=update_item_params,
-                )
-
-            elif kernel == "sigmoid":
-                kernel_sigmoid_sgd_update(
-                    user_id=user_id,
-                    item_id=item_id,
-                    rating=rating,
-                    global_mean=global_mean,
-                    user_biases=user_biases,
-                    item_biases=item_biases,
-                    user_features=user_features,
-                    item_features=item_features,
-                    lr=lr,
-                    reg=reg,
-                    a=min_rating,
-                    c=max_rating - min_rating,
-                    update_user_params=update_user_params,
-                    update_item_params=update_item_params,
-                )
-
-            elif kernel == "rbf":
-                kernel_rbf_sgd_update(
-                    user_id=user_id,
-                    item_id=item_id,
-                    rating=rating,
-                    user_features=user_features,
-                    item_features=item_features,
-                    lr=lr,
-                    reg=reg,
-                    gamma=gamma,
-                    a=min_rating,
-                    c=max_rating - min_rating,
-                    update_user_params=update_user_params,
-                    update_item_params=update_item_params,
-                )
-
-            if not update_item_biases:
-                item_biases *= 0
+        for i in order:
+            user_id, item_id, rating = user_ids[i], item_ids[i], ratings[i]
+
+            _sgd_step(
+                user_id=user_id,
+                item_id=item_id,
+                rating=rating,
+                global_mean=global_mean,
+                user_biases=user_biases,
+                item_biases=item_biases,
+                user_features=user_features,
+                item_features=item_features,
+                user_bias_velocity=user_bias_velocity,
+                item_bias_velocity=item_bias_velocity,
+                user_feature_velocity=user_feature_velocity,
+                item_feature_velocity=item_feature_velocity,
+                kernel=kernel,
+                gamma=gamma,
+                lr=epoch_lr,
+                reg=reg,
+                momentum=momentum,
+                nesterov=nesterov,
+                min_rating=min_rating,
+                max_rating=max_rating,
+                update_user_params=update_user_params,
+                update_item_params=update_item_params,
+                update_item_biases=update_item_biases,
+            )
+
+        # Calculate error and print
+        rmse = _calculate_rmse(
+            user_ids=user_ids,
+            item_ids=item_ids,
+            ratings=ratings,
+            global_mean=global_mean,
+            user_biases=user_biases,
+            item_biases=item_biases,
+            user_features=user_features,
+            item_features=item_features,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            kernel=kernel,
+            gamma=gamma,
+        )
+        train_rmse.append(rmse)
+
+        if verbose == 1:
+            print("Epoch ", epoch + 1, "/", n_epochs, " -  train_rmse:", rmse)
+
+    return user_features, item_features, user_biases, item_biases, train_rmse
+
+
+def _group_by(ids: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Groups the rows of a vector of integer ids in the range [0, n_groups) in compressed sparse row format
+
+    Arguments:
+        ids {numpy array} -- Vector of integer ids
+        n_groups {int} -- Number of possible ids
+
+    Returns:
+        order [np.ndarray] -- Indices of the rows sorted by id
+        ptr [np.ndarray] -- Rows with id g are order[ptr[g]:ptr[g + 1]]
+    """
+    order = np.argsort(ids, kind="stable").astype(np.int32)
+    ptr = np.zeros(n_groups + 1, dtype=np.int64)
+    ptr[1:] = np.cumsum(np.bincount(ids, minlength=n_groups))
+
+    return order, ptr
+
+
+def _stratify(
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
+    n_users: int,
+    n_items: int,
+    n_blocks: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Partitions the user-item ratings into a n_blocks x n_blocks grid of blocks by randomly permuting the assigned user ids and item ids
+    and splitting them into n_blocks contiguous ranges each. Ratings in block (b, c) belong to users of range b and items of range c.
+    The permutation spreads popular users and items, which are assigned the lowest ids, evenly across the blocks.
+
+    Arguments:
+        user_ids {numpy array} -- Vector of assigned user ids
+        item_ids {numpy array} -- Vector of assigned item ids
+        n_users {int} -- Number of users
+        n_items {int} -- Number of items
+        n_blocks {int} -- Number of ranges to split users and items into
+
+    Returns:
+        block_order [np.ndarray] -- Indices of the ratings sorted by block
+        block_ptr [np.ndarray] -- Ratings of block (b, c) are block_order[block_ptr[k]:block_ptr[k + 1]] with k = b * n_blocks + c
+    """
+    user_blocks = np.random.permutation(n_users)[user_ids] * n_blocks // n_users
+    item_blocks = np.random.permutation(n_items)[item_ids] * n_blocks // n_items
+    blocks = user_blocks * n_blocks + item_blocks
+
+    block_order, block_ptr = _group_by(ids=blocks, n_groups=n_blocks * n_blocks)
+
+    return block_order, block_ptr
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def _stratified_sgd(
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
+    ratings: np.ndarray,
+    block_order: np.ndarray,
+    block_ptr: np.ndarray,
+    n_blocks: int,
+    global_mean: float,
+    user_biases: np.ndarray,
+    item_biases: np.ndarray,
+    user_features: np.ndarray,
+    item_features: np.ndarray,
+    user_bias_velocity: np.ndarray,
+    item_bias_velocity: np.ndarray,
+    user_feature_velocity: np.ndarray,
+    item_feature_velocity: np.ndarray,
+    n_epochs: int,
+    kernel: str,
+    gamma: float,
+    lr: float,
+    reg: float,
+    min_rating: float,
+    max_rating: float,
+    verbose: int,
+    update_item_biases: bool = True,
+    lr_decay: float = 0.0,
+    momentum: float = 0.0,
+    nesterov: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, list]:
+    """
+    Performs stratified stochastic gradient descent (DSGD) to estimate parameters. Each epoch is split into n_blocks sub-epochs, and in each
+    sub-epoch the blocks (b, (b + shift) % n_blocks) are processed in parallel. These blocks share no users and no items so the parallel
+    updates never touch the same parameters.
+
+    Arguments:
+        user_ids {numpy array} -- Contiguous int32 vector of assigned user ids
+        item_ids {numpy array} -- Contiguous int32 vector of assigned item ids
+        ratings {numpy array} -- Contiguous vector of ratings for each user and item
+        block_order {numpy array} -- Indices of the ratings sorted by block as returned by _stratify
+        block_ptr {numpy array} -- Start of each block in block_order as returned by _stratify
+        n_blocks {int} -- Number of ranges the users and items were split into
+        global_mean {float} -- Global mean of all ratings
+        user_biases {numpy array} -- User biases vector of shape (n_users, 1)
+        item_biases {numpy array} -- Item biases vector of shape (n_items, 1)
+        user_features {numpy array} -- Start matrix P of user features of shape (n_users, n_factors)
+        item_features {numpy array} -- Start matrix Q of item features of shape (n_items, n_factors)
+        user_bias_velocity {numpy array} -- Momentum velocities of user biases. Only used if momentum is positive
+        item_bias_velocity {numpy array} -- Momentum velocities of item biases. Only used if momentum is positive
+        user_feature_velocity {numpy array} -- Momentum velocities of user features. Only used if momentum is positive
+        item_feature_velocity {numpy array} -- Momentum velocities of item features. Only used if momentum is positive
+        n_epochs {int} -- Number of epochs to run
+        kernel {str} -- Kernel function to use between user and item features. Options are 'linear', 'logistic', and 'rbf'.
+        gamma {float} -- Kernel coefficient for 'rbf'. Ignored by other kernels.
+        lr {float} -- Learning rate alpha
+        reg {float} -- Regularization parameter lambda for Frobenius norm
+        min_rating {float} -- Minimum possible rating
+        max_rating {float} -- Maximum possible rating
+        verbose {int} -- Verbosity when fitting. 0 for nothing and 1 for printing epochs
+        update_item_biases {bool} -- Whether to update item biases or keep them at zero. Default is True.
+        lr_decay {float} -- Decay rate of the learning rate. The learning rate of epoch t is lr / (1 + lr_decay * t). Default is 0.
+        momentum {float} -- Momentum coefficient. 0 for plain stochastic gradient descent. Default is 0.
+        nesterov {bool} -- Whether to use Nesterov momentum. Default is False.
+
+    Returns:
+        user_features [np.ndarray] -- Updated user_features matrix P
+        item_features [np.ndarray] -- Updated item_features matrix Q
+        user_biases [np.ndarray] -- Updated user_biases vector
+        item_biases [np.ndarray] -- Updated item_bases vector
+        train_rmse [list] -- Training rmse values
+    """
+    # Compile a separate specialization for each value of update_item_biases so that the item bias updates are removed at compile time
+    # when they are not needed instead of being checked for every rating
+    nb.literally(update_item_biases)
+
+    train_rmse = []
+
+    for epoch in range(n_epochs):
+        # Learning rate for this epoch following an inverse time decay schedule
+        epoch_lr = lr / (1 + lr_decay * epoch)
+
+        # Visit the strata in a new random order each epoch
+        for shift in np.random.permutation(n_blocks):
+
+            # Blocks of the same stratum are independent so are processed in parallel
+            for b in nb.prange(n_blocks):
+                block = b * n_blocks + (b + shift) % n_blocks
+                rows = block_order[block_ptr[block] : block_ptr[block + 1]]
+                np.random.shuffle(rows)
+
+                for i in rows:
+                    _sgd_step(
+                        user_id=user_ids[i],
+                        item_id=item_ids[i],
+                        rating=ratings[i],
+                        global_mean=global_mean,
+                        user_biases=user_biases,
+                        item_biases=item_biases,
+                        user_features=user_features,
+                        item_features=item_features,
+                        user_bias_velocity=user_bias_velocity,
+                        item_bias_velocity=item_bias_velocity,
+                        user_feature_velocity=user_feature_velocity,
+                        item_feature_velocity=item_feature_velocity,
+                        kernel=kernel,
+                        gamma=gamma,
+                        lr=epoch_lr,
+                        reg=reg,
+                        momentum=momentum,
+                        nesterov=nesterov,
+                        min_rating=min_rating,
+                        max_rating=max_rating,
+                        update_user_params=True,
+                        update_item_params=True,
+                        update_item_biases=update_item_biases,
+                    )
 
         # Calculate error and print
         rmse = _calculate_rmse(
-            X=X,
+            user_ids=user_ids,
+            item_ids=item_ids,
+            ratings=ratings,
             global_mean=global_mean,
             user_biases=user_biases,
             item_biases=item_biases,
@@ -452,9 +947,181 @@ def _sgd(
     return user_features, item_features, user_biases, item_biases, train_rmse
 
 
+@nb.njit(fastmath=True, boundscheck=False, cache=True)
+def _als_solve(
+    rows: np.ndarray,
+    other_ids: np.ndarray,
+    ratings: np.ndarray,
+    offsets: np.ndarray,
+    other_features: np.ndarray,
+    reg: float,
+    fit_bias: bool,
+) -> np.ndarray:
+    """
+    Solves the regularized least squares problem for the bias and latent factors of a single user or item with the other side held constant
+
+    Arguments:
+        rows {numpy array} -- Indices of the ratings belonging to the user or item
+        other_ids {numpy array} -- Vector of assigned ids of the other side (items when solving for a user and vice versa)
+        ratings {numpy array} -- Vector of ratings for each user and item
+        offsets {numpy array} -- Known part of the prediction for each rating, i.e. the global mean plus the other side's bias
+        other_features {numpy array} -- Latent factor matrix of the other side
+        reg {float} -- Regularization parameter lambda
+        fit_bias {bool} -- Whether to solve for a bias term along with the latent factors
+
+    Returns:
+        solution [np.ndarray] -- The bias (if fit_bias) followed by the latent factors
+    """
+    n_factors = other_features.shape[1]
+    start = 1 if fit_bias else 0
+    size = n_factors + start
+
+    A = reg * np.eye(size)
+    b = np.zeros(size)
+    x = np.ones(size)
+
+    # Accumulate normal equations A w = b
+    for i in rows:
+        other_id = other_ids[i]
+        for f in range(n_factors):
+            x[start + f] = other_features[other_id, f]
+
+        target = ratings[i] - offsets[i]
+        for f in range(size):
+            b[f] += target * x[f]
+            for g in range(size):
+                A[f, g] += x[f] * x[g]
+
+    # Use least squares so that unregularized problems with few ratings are still solvable
+    solution = np.linalg.lstsq(A, b)[0]
+
+    return solution
+
+
+@nb.njit(parallel=True, fastmath=True, boundscheck=False, cache=True)
+def _als(
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
+    ratings: np.ndarray,
+    user_order: np.ndarray,
+    user_ptr: np.ndarray,
+    item_order: np.ndarray,
+    item_ptr: np.ndarray,
+    global_mean: float,
+    user_biases: np.ndarray,
+    item_biases: np.ndarray,
+    user_features: np.ndarray,
+    item_features: np.ndarray,
+    n_epochs: int,
+    reg: float,
+    min_rating: float,
+    max_rating: float,
+    verbose: int,
+    update_item_biases: bool = True,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, list]:
+    """
+    Performs Alternating Least Squares to estimate parameters for the linear kernel. For every epoch, the item parameters are held constant
+    while solving directly for the bias and latent factors of each user, which is a small ridge regression over the items the user rated.
+    Then the user parameters are held constant and the same is done for every item. Each user (and each item) is solved independently
+    of the others so they are solved in parallel.
+
+    Arguments:
+        user_ids {numpy array} -- Contiguous int32 vector of assigned user ids
+        item_ids {numpy array} -- Contiguous int32 vector of assigned item ids
+        ratings {numpy array} -- Contiguous vector of ratings for each user and item
+        user_order {numpy array} -- Indices of the ratings sorted by user as returned by _group_by
+        user_ptr {numpy array} -- Start of each user in user_order as returned by _group_by
+        item_order {numpy array} -- Indices of the ratings sorted by item as returned by _group_by
+        item_ptr {numpy array} -- Start of each item in item_order as returned by _group_by
+        global_mean {float} -- Global mean of all ratings
+        user_biases {numpy array} -- User biases vector of shape (n_users, 1)
+        item_biases {numpy array} -- Item biases vector of shape (n_items, 1)
+        user_features {numpy array} -- Start matrix P of user features of shape (n_users, n_factors)
+        item_features {numpy array} -- Start matrix Q of item features of shape (n_items, n_factors)
+        n_epochs {int} -- Number of epochs to run
+        reg {float} -- Regularization parameter lambda for Frobenius norm
+        min_rating {float} -- Minimum possible rating
+        max_rating {float} -- Maximum possible rating
+        verbose {int} -- Verbosity when fitting. 0 for nothing and 1 for printing epochs
+        update_item_biases {bool} -- Whether to update item biases or keep them at zero. Default is True.
+
+    Returns:
+        user_features [np.ndarray] -- Updated user_features matrix P
+        item_features [np.ndarray] -- Updated item_features matrix Q
+        user_biases [np.ndarray] -- Updated user_biases vector
+        item_biases [np.ndarray] -- Updated item_bases vector
+        train_rmse [list] -- Training rmse values
+    """
+    n_users = user_features.shape[0]
+    n_items = item_features.shape[0]
+    n_ratings = ratings.shape[0]
+    offsets = np.zeros(n_ratings)
+    train_rmse = []
+
+    for epoch in range(n_epochs):
+        # Update user parameters with item parameters held constant
+        for i in nb.prange(n_ratings):
+            offsets[i] = global_mean + item_biases[item_ids[i]]
+
+        for u in nb.prange(n_users):
+            solution = _als_solve(
+                rows=user_order[user_ptr[u] : user_ptr[u + 1]],
+                other_ids=item_ids,
+                ratings=ratings,
+                offsets=offsets,
+                other_features=item_features,
+                reg=reg,
+                fit_bias=True,
+            )
+            user_biases[u] = solution[0]
+            user_features[u, :] = solution[1:]
+
+        # Update item parameters with user parameters held constant
+        for i in nb.prange(n_ratings):
+            offsets[i] = global_mean + user_biases[user_ids[i]]
+
+        start = 1 if update_item_biases else 0
+        for v in nb.prange(n_items):
+            solution = _als_solve(
+                rows=item_order[item_ptr[v] : item_ptr[v + 1]],
+                other_ids=user_ids,
+                ratings=ratings,
+                offsets=offsets,
+                other_features=user_features,
+                reg=reg,
+                fit_bias=update_item_biases,
+            )
+            if update_item_biases:
+                item_biases[v] = solution[0]
+            item_features[v, :] = solution[start:]
+
+        # Calculate error and print
+        rmse = _calculate_rmse(
+            user_ids=user_ids,
+            item_ids=item_ids,
+            ratings=ratings,
+            global_mean=global_mean,
+            user_biases=user_biases,
+            item_biases=item_biases,
+            user_features=user_features,
+            item_features=item_features,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            kernel="linear",
+            gamma=0.0,
+        )
+        train_rmse.append(rmse)
+
+        if verbose == 1:
+            print("Epoch ", epoch + 1, "/", n_epochs, " -  train_rmse:", rmse)
+
+    return user_features, item_features, user_biases, item_biases, train_rmse
+
+
 @nb.njit()
 def _predict(
-    X: np.ndarray,
+    user_ids: np.ndarray,
+    item_ids: np.ndarray,
     global_mean: float,
     user_biases: np.ndarray,
     item_biases: np.ndarray,
@@ -465,12 +1132,13 @@ def _predict(
     kernel: str,
     gamma: float,
     bound_ratings: bool,
-) -> Tuple[list, list]:
+) -> Tuple[np.ndarray, np.ndarray]:
     """ 
     Calculate predicted ratings for each user-item pair.
 
     Arguments:
-        X {np.ndarray} -- Matrix with columns representing (user_id, item_id)
+        user_ids {np.ndarray} -- Vector of assigned user ids, -1 for unknown users
+        item_ids {np.ndarray} -- Vector of assigned item ids, -1 for unknown items
         global_mean {float} -- Global mean of all ratings
         user_biases {np.ndarray} -- User biases vector of length n_users
         item_biases {np.ndarray} -- Item biases vector of length n_items
@@ -483,15 +1151,19 @@ def _predict(
         bound_ratings (bool): Whether to bound ratings in range [min_rating, max_rating] (default: True)
 
     Returns:
-        predictions [np.ndarray] -- Vector containing rating predictions of all user, items in same order as input X
+        predictions [np.ndarray] -- Vector containing rating predictions of all user, items in same order as input user_ids and item_ids
         predictions_possible [np.ndarray] -- Vector of whether both given user and item were contained in the data that the model was fitted on
     """
     n_factors = user_features.shape[1]
-    predictions = []
-    predictions_possible = []
+    n_predictions = user_ids.shape[0]
+    predictions = np.empty(n_predictions)
+    predictions_possible = np.empty(n_predictions, dtype=np.bool_)
+
+    # Latent factors used for unknown users and items
+    zero_feature_vec = np.zeros(n_factors, dtype=user_features.dtype)
 
-    for i in range(X.shape[0]):
-        user_id, item_id = int(X[i, 0]), int(X[i, 1])
+    for i in range(n_predictions):
+        user_id, item_id = user_ids[i], item_ids[i]
         user_known = user_id != -1
         item_known = item_id != -1
 
@@ -499,10 +1171,10 @@ def _predict(
         user_bias = user_biases[user_id] if user_known else 0
         item_bias = item_biases[item_id] if item_known else 0
         user_feature_vec = (
-            user_features[user_id, :] if user_known else np.zeros(n_factors)
+            user_features[user_id, :] if user_known else zero_feature_vec
         )
         item_feature_vec = (
-            item_features[item_id, :] if item_known else np.zeros(n_factors)
+            item_features[item_id, :] if item_known else zero_feature_vec
         )
 
         # Calculate predicted rating given kernel
@@ -542,7 +1214,7 @@ def _predict(
             elif rating_pred < min_rating:
                 rating_pred = min_rating
 
-        predictions.append(rating_pred)
-        predictions_possible.append(user_known and item_known)
+        predictions[i] = rating_pred
+        predictions_possible[i] = user_known and item_known
 
     return predictions, predictions_possible
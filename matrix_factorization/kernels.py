@@ -2,6 +2,8 @@ import math
 import numba as nb
 import numpy as np
 
+from typing import Tuple
+
 
 @nb.njit()
 def sigmoid(x: float) -> float:
@@ -106,6 +108,32 @@ def kernel_rbf(
 
 
 @nb.njit()
+def momentum_step(
+    gradient: float, velocity: float, momentum: float, nesterov: bool
+) -> Tuple[float, float]:
+    """
+    Applies momentum to the gradient of a single parameter. The velocity is updated as v = momentum * v + gradient and the step
+    taken is v, or gradient + momentum * v with Nesterov momentum.
+
+    Args:
+        gradient (float): Gradient of the parameter
+        velocity (float): Current velocity of the parameter
+        momentum (float): Momentum coefficient
+        nesterov (bool): Whether to use Nesterov momentum
+
+    Returns:
+        [float]: Step to take in place of the gradient
+        [float]: Updated velocity
+    """
+    velocity = momentum * velocity + gradient
+
+    if nesterov:
+        return gradient + momentum * velocity, velocity
+
+    return velocity, velocity
+
+
+@nb.njit(fastmath=True, cache=True)
 def kernel_linear_sgd_update(
     user_id: int,
     item_id: int,
@@ -115,10 +143,17 @@ def kernel_linear_sgd_update(
     item_biases: np.ndarray,
     user_features: np.ndarray,
     item_features: np.ndarray,
+    user_bias_velocity: np.ndarray,
+    item_bias_velocity: np.ndarray,
+    user_feature_velocity: np.ndarray,
+    item_feature_velocity: np.ndarray,
     lr: float,
     reg: float,
+    momentum: float,
+    nesterov: bool,
     update_user_params: bool = True,
     update_item_params: bool = True,
+    update_item_biases: bool = True,
 ):
     """
     Performs a single update using stochastic gradient descent for a linear kernel given a user and item. 
@@ -135,10 +170,17 @@ def kernel_linear_sgd_update(
         item_biases {numpy array} -- Item biases vector of shape (n_items, 1)
         user_features {numpy array} -- Matrix P of user features of shape (n_users, n_factors)
         item_features {numpy array} -- Matrix Q of item features of shape (n_items, n_factors)
+        user_bias_velocity {numpy array} -- Momentum velocities of user biases. Only used if momentum is positive
+        item_bias_velocity {numpy array} -- Momentum velocities of item biases. Only used if momentum is positive
+        user_feature_velocity {numpy array} -- Momentum velocities of user features. Only used if momentum is positive
+        item_feature_velocity {numpy array} -- Momentum velocities of item features. Only used if momentum is positive
         lr (float): Learning rate alpha
         reg {float} -- Regularization parameter lambda for Frobenius norm
+        momentum (float): Momentum coefficient. 0 for plain stochastic gradient descent
+        nesterov (bool): Whether to use Nesterov momentum
         update_user_params {bool} -- Whether to update user parameters or not. Default is True.
         update_item_params {bool} -- Whether to update item parameters or not. Default is True.
+        update_item_biases {bool} -- Whether to update item biases or keep them unchanged. Default is True.
     """
     n_factors = user_features.shape[1]
     user_bias = user_biases[user_id]
@@ -157,10 +199,22 @@ def kernel_linear_sgd_update(
 
     # Update bias parameters
     if update_user_params:
-        user_biases[user_id] -= lr * (error + reg * user_bias)
+        opt_deriv = error + reg * user_bias
+        if momentum > 0:
+            opt_deriv, velocity = momentum_step(
+                opt_deriv, user_bias_velocity[user_id], momentum, nesterov
+            )
+            user_bias_velocity[user_id] = velocity
+        user_biases[user_id] -= lr * opt_deriv
 
-    if update_item_params:
-        item_biases[item_id] -= lr * (error + reg * item_bias)
+    if update_item_params and update_item_biases:
+        opt_deriv = error + reg * item_bias
+        if momentum > 0:
+            opt_deriv, velocity = momentum_step(
+                opt_deriv, item_bias_velocity[item_id], momentum, nesterov
+            )
+            item_bias_velocity[item_id] = velocity
+        item_biases[item_id] -= lr * opt_deriv
 
     # Update user and item features
     for f in range(n_factors):
@@ -168,19 +222,27 @@ def kernel_linear_sgd_update(
         item_feature_f = item_features[item_id, f]
 
         if update_user_params:
-            user_features[user_id, f] -= lr * (
-                error * item_feature_f + reg * user_feature_f
-            )
+            opt_deriv = error * item_feature_f + reg * user_feature_f
+            if momentum > 0:
+                opt_deriv, velocity = momentum_step(
+                    opt_deriv, user_feature_velocity[user_id, f], momentum, nesterov
+                )
+                user_feature_velocity[user_id, f] = velocity
+            user_features[user_id, f] -= lr * opt_deriv
 
         if update_item_params:
-            item_features[item_id, f] -= lr * (
-                error * user_feature_f + reg * item_feature_f
-            )
+            opt_deriv = error * user_feature_f + reg * item_feature_f
+            if momentum > 0:
+                opt_deriv, velocity = momentum_step(
+                    opt_deriv, item_feature_velocity[item_id, f], momentum, nesterov
+                )
+                item_feature_velocity[item_id, f] = velocity
+            item_features[item_id, f] -= lr * opt_deriv
 
     return
 
 
-@nb.njit()
+@nb.njit(fastmath=True, cache=True)
 def kernel_sigmoid_sgd_update(
     user_id: int,
     item_id: int,
@@ -190,12 +252,19 @@ def kernel_sigmoid_sgd_update(
     item_biases: np.ndarray,
     user_features: np.ndarray,
     item_features: np.ndarray,
+    user_bias_velocity: np.ndarray,
+    item_bias_velocity: np.ndarray,
+    user_feature_velocity: np.ndarray,
+    item_feature_velocity: np.ndarray,
     lr: float,
     reg: float,
+    momentum: float,
+    nesterov: bool,
     a: float,
     c: float,
     update_user_params: bool = True,
     update_item_params: bool = True,
+    update_item_biases: bool = True,
 ):
     """
     Performs a single update using stochastic gradient descent for a sigmoid kernel given a user and item. 
@@ -209,12 +278,19 @@ def kernel_sigmoid_sgd_update(
         item_biases {numpy array} -- Item biases vector of shape (n_items, 1)
         user_features {numpy array} -- Matrix P of user features of shape (n_users, n_factors)
         item_features {numpy array} -- Matrix Q of item features of shape (n_items, n_factors)
+        user_bias_velocity {numpy array} -- Momentum velocities of user biases. Only used if momentum is positive
+        item_bias_velocity {numpy array} -- Momentum velocities of item biases. Only used if momentum is positive
+        user_feature_velocity {numpy array} -- Momentum velocities of user features. Only used if momentum is positive
+        item_feature_velocity {numpy array} -- Momentum velocities of item features. Only used if momentum is positive
         lr (float): Learning rate alpha
         reg {float} -- Regularization parameter lambda for Frobenius norm
+        momentum (float): Momentum coefficient. 0 for plain stochastic gradient descent
+        nesterov (bool): Whether to use Nesterov momentum
         a (float): Rescaling parameter for a + c * K(u, i)
         c (float): Rescaling parameter for a + c * K(u, i)
         update_user_params {bool} -- Whether to update user parameters or not. Default is True.
         update_item_params {bool} -- Whether to update item parameters or not. Default is True.
+        update_item_biases {bool} -- Whether to update item biases or keep them unchanged. Default is True.
     """
     n_factors = user_features.shape[1]
     user_bias = user_biases[user_id]
@@ -238,10 +314,20 @@ def kernel_sigmoid_sgd_update(
     # Update bias parameters
     if update_user_params:
         opt_deriv = error * deriv_base + reg * user_bias
+        if momentum > 0:
+            opt_deriv, velocity = momentum_step(
+                opt_deriv, user_bias_velocity[user_id], momentum, nesterov
+            )
+            user_bias_velocity[user_id] = velocity
         user_biases[user_id] -= lr * opt_deriv
 
-    if update_item_params:
+    if update_item_params and update_item_biases:
         opt_deriv = error * deriv_base + reg * item_bias
+        if momentum > 0:
+            opt_deriv, velocity = momentum_step(
+                opt_deriv, item_bias_velocity[item_id], momentum, nesterov
+            )
+            item_bias_velocity[item_id] = velocity
         item_biases[item_id] -= lr * opt_deriv
 
     # Update user and item features
@@ -252,25 +338,39 @@ def kernel_sigmoid_sgd_update(
         if update_user_params:
             user_feature_deriv = item_feature_f * deriv_base
             opt_deriv = error * user_feature_deriv + reg * user_feature_f
+            if momentum > 0:
+                opt_deriv, velocity = momentum_step(
+                    opt_deriv, user_feature_velocity[user_id, i], momentum, nesterov
+                )
+                user_feature_velocity[user_id, i] = velocity
             user_features[user_id, i] -= lr * opt_deriv
 
         if update_item_params:
             item_feature_deriv = user_feature_f * deriv_base
             opt_deriv = error * item_feature_deriv + reg * item_feature_f
+            if momentum > 0:
+                opt_deriv, velocity = momentum_step(
+                    opt_deriv, item_feature_velocity[item_id, i], momentum, nesterov
+                )
+                item_feature_velocity[item_id, i] = velocity
             item_features[item_id, i] -= lr * opt_deriv
 
     return
 
 
-@nb.njit()
+@nb.njit(fastmath=True, cache=True)
 def kernel_rbf_sgd_update(
     user_id: int,
     item_id: int,
     rating: float,
     user_features: np.ndarray,
     item_features: np.ndarray,
+    user_feature_velocity: np.ndarray,
+    item_feature_velocity: np.ndarray,
     lr: float,
     reg: float,
+    momentum: float,
+    nesterov: bool,
     gamma: float,
     a: float,
     c: float,
@@ -286,8 +386,12 @@ def kernel_rbf_sgd_update(
         rating (float): Rating for user and item
         user_features {numpy array} -- Matrix P of user features of shape (n_users, n_factors)
         item_features {numpy array} -- Matrix Q of item features of shape (n_items, n_factors)
+        user_feature_velocity {numpy array} -- Momentum velocities of user features. Only used if momentum is positive
+        item_feature_velocity {numpy array} -- Momentum velocities of item features. Only used if momentum is positive
         lr (float): Learning rate alpha
         reg {float} -- Regularization parameter lambda for Frobenius norm
+        momentum (float): Momentum coefficient. 0 for plain stochastic gradient descent
+        nesterov (bool): Whether to use Nesterov momentum
         gamma (float): Kernel coefficient
         a (float): Rescaling parameter for a + c * K(u, i)
         c (float): Rescaling parameter for a + c * K(u, i)
@@ -317,11 +421,21 @@ def kernel_rbf_sgd_update(
         if update_user_params:
             user_feature_deriv = deriv_base * (item_feature_f - user_feature_f)
             opt_deriv = error * user_feature_deriv + reg * user_feature_f
+            if momentum > 0:
+                opt_deriv, velocity = momentum_step(
+                    opt_deriv, user_feature_velocity[user_id, i], momentum, nesterov
+                )
+                user_feature_velocity[user_id, i] = velocity
             user_features[user_id, i] -= lr * opt_deriv
 
         if update_item_params:
             item_feature_deriv = deriv_base * (user_feature_f - item_feature_f)
             opt_deriv = error * item_feature_deriv + reg * item_feature_f
+            if momentum > 0:
+                opt_deriv, velocity = momentum_step(
+                    opt_deriv, item_feature_velocity[item_id, i], momentum, nesterov
+                )
+                item_feature_velocity[item_id, i] = velocity
             item_features[item_id, i] -= lr * opt_deriv
 
     return
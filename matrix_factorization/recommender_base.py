@@ -3,7 +3,22 @@ import pandas as pd
 from sklearn.base import BaseEstimator, RegressorMixin
 
 from abc import ABCMeta, abstractmethod
-from typing import Any, Tuple, Union
+from typing import Any, NamedTuple, Optional, Tuple, Union
+
+
+class UserItemRatings(NamedTuple):
+    """
+    Preprocessed user-item ratings stored as separate contiguous vectors
+
+    Attributes:
+        user_ids {numpy array} -- int32 vector of assigned user ids, -1 for unknown users
+        item_ids {numpy array} -- int32 vector of assigned item ids, -1 for unknown items
+        ratings {numpy array} -- float32 vector of ratings. None when preprocessing for predict
+    """
+
+    user_ids: np.ndarray
+    item_ids: np.ndarray
+    ratings: Optional[np.ndarray]
 
 
 class RecommenderBase(BaseEstimator, RegressorMixin, metaclass=ABCMeta):
@@ -57,7 +72,7 @@ class RecommenderBase(BaseEstimator, RegressorMixin, metaclass=ABCMeta):
         Returns:
             bool: If user_id is known
         """
-        return user_id in self.known_users
+        return user_id in self.user_id_map
 
     def contains_item(self, item_id: Any) -> bool:
         """
@@ -69,11 +84,11 @@ class RecommenderBase(BaseEstimator, RegressorMixin, metaclass=ABCMeta):
         Returns:
             bool: If item_id is known
         """
-        return item_id in self.known_items
+        return item_id in self.item_id_map
 
     def _preprocess_data(
         self, X: pd.DataFrame, y: pd.Series = None, type: str = "fit"
-    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, list, list]]:
+    ) -> Union[UserItemRatings, Tuple[UserItemRatings, list, list]]:
         """
         Preprocessing steps before doing fit, update or predict
 
@@ -83,7 +98,7 @@ class RecommenderBase(BaseEstimator, RegressorMixin, metaclass=ABCMeta):
             type {str} -- The type of preprocessing to do. Allowed options are ('fit', 'predict', 'update'). Defaults to 'fit'
 
         Returns:
-            X [pd.DataFrame] -- Dataframe with columns user_id, item_id and rating
+            data [UserItemRatings] -- Vectors of assigned user ids, assigned item ids and ratings
             known_users [list, 'on update only'] -- List containing already known users in X. Only returned for type update
             new_users [list, 'on update only'] -- List containing new users in X. Only returned for type update
         """
@@ -94,53 +109,61 @@ class RecommenderBase(BaseEstimator, RegressorMixin, metaclass=ABCMeta):
 
         if type in ("fit", "update"):
             # Check for duplicate user-item ratings
-            if X.duplicated(subset=["user_id", "item_id"]).sum() != 0:
+            if X.duplicated(subset=["user_id", "item_id"]).any():
                 raise ValueError("Duplicate user-item ratings in matrix")
 
-            # Shuffle rows
-            X = X.sample(frac=1, replace=False)
-
         if type == "fit":
-            # Create mapping of user_id and item_id to assigned integer ids
-            user_ids = X["user_id"].unique()
-            item_ids = X["item_id"].unique()
-            self.user_id_map = {user_id: i for (i, user_id) in enumerate(user_ids)}
-            self.item_id_map = {item_id: i for (i, item_id) in enumerate(item_ids)}
+            # Create mapping of user_id and item_id to assigned integer ids in order of first appearance. Missing ids are kept as
+            # an id of their own
+            user_ids = pd.Index(X["user_id"].unique())
+            item_ids = pd.Index(X["item_id"].unique())
+            user_codes = user_ids.get_indexer(X["user_id"].values)
+            item_codes = item_ids.get_indexer(X["item_id"].values)
+            self.user_id_map = dict(zip(user_ids, range(len(user_ids))))
+            self.item_id_map = dict(zip(item_ids, range(len(item_ids))))
+            self._user_categories = user_ids
+            self._item_categories = item_ids
             self.n_users = len(user_ids)
             self.n_items = len(item_ids)
 
-        elif type == "update":
-            # Keep only item ratings for which the item is already known
-            items = self.item_id_map.keys()
-            X = X.query("item_id in @items").copy()
+        else:
+            # Remap user id and item id to assigned integer ids. Ids that are not known are given -1
+            item_codes = self._item_categories.get_indexer(X["item_id"].values)
+
+            if type == "update":
+                # Keep only item ratings for which the item is already known
+                known_items = item_codes != -1
+                X = X[known_items]
+                item_codes = item_codes[known_items]
 
-            # Add information on new users
-            new_users, known_users = [], []
-            users = X["user_id"].unique()
-            new_user_id = max(self.user_id_map.values()) + 1
+            user_codes = self._user_categories.get_indexer(X["user_id"].values)
 
-            for user in users:
-                if user in self.user_id_map.keys():
-                    known_users.append(user)
-                    continue
+        if type == "update":
+            # Add information on new users by assigning them ids after the known users
+            new_rows = user_codes == -1
+            new_users = list(pd.unique(X["user_id"].values[new_rows]))
+            known_users = list(pd.unique(X["user_id"].values[~new_rows]))
 
-                # Add to user id mapping
-                new_users.append(user)
+            new_user_id = len(self._user_categories)
+            for user in new_users:
                 self.user_id_map[user] = new_user_id
                 new_user_id += 1
 
-        # Remap user id and item id to assigned integer ids
-        X.loc[:, "user_id"] = X["user_id"].map(self.user_id_map)
-        X.loc[:, "item_id"] = X["item_id"].map(self.item_id_map)
+            self._user_categories = self._user_categories.append(pd.Index(new_users))
+            user_codes[new_rows] = self._user_categories.get_indexer(
+                X["user_id"].values[new_rows]
+            )
 
-        if type == "predict":
-            # Replace missing mappings with -1
-            X.fillna(-1, inplace=True)
+        data = UserItemRatings(
+            user_ids=user_codes.astype(np.int32),
+            item_ids=item_codes.astype(np.int32),
+            ratings=None if type == "predict" else X["rating"].to_numpy(np.float32),
+        )
 
         if type == "update":
-            return X, known_users, new_users
+            return data, known_users, new_users
         else:
-            return X
+            return data
 
     @abstractmethod
     def fit(self, X: pd.DataFrame, y: pd.Series):
@@ -187,12 +210,11 @@ class RecommenderBase(BaseEstimator, RegressorMixin, metaclass=ABCMeta):
         Returns:
             pd.DataFrame: Recommendations DataFrame for user with columns user_id (optional), item_id, rating sorted from highest to lowest rating 
         """
-        items = list(self.item_id_map.keys())
+        items = self._item_categories
 
         # If items_known is provided then filter by items that the user does not know
         if items_known is not None:
-            items_known = list(items_known)
-            items = [item for item in items if item not in items_known]
+            items = items.difference(pd.Index(items_known), sort=False)
 
         # Get rating predictions for given user and all unknown items
         items_recommend = pd.DataFrame({"user_id": user, "item_id": items})